@@ -1,29 +1,97 @@
 import browser_history
+import numpy as np
 import pandas as pd
 from collections import Counter
 from urllib.parse import urlparse
+import heapq
+from operator import itemgetter
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import re
 from typing import Dict, List, Tuple
 import json
+import functools
+
+try:
+    import ahocorasick  # pyahocorasick, for single-pass keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    from bounter import bounter  # approximate counting for very large histories
+except ImportError:
+    bounter = None
+
+# URL tokens are runs of word characters; anything shorter than 3 is noise
+_TOKEN_RE = re.compile(r"\w{3,}")
+_URL_COMMON_TERMS = frozenset({'com', 'www', 'http', 'https', 'org', 'net'})
+
+# Stopwords and common URL terms are excluded from content analysis
+try:
+    nltk.download("stopwords", quiet=True)
+    _STOP_WORDS = frozenset(stopwords.words('english')) | _URL_COMMON_TERMS
+except Exception as e:
+    print(f"Warning: NLTK stopwords unavailable: {e}")
+    _STOP_WORDS = _URL_COMMON_TERMS
+
+# Network location of an absolute URL, as urlparse would report it
+_NETLOC_RE = re.compile(r'^[a-z][a-z0-9+.-]*://([^/?#]*)', re.IGNORECASE)
+
+# Histories with at least this many rows count terms in a bounded-memory bounter
+# hash table (not a Count-Min Sketch, which can't list items for the top-k)
+_EXACT_COUNT_THRESHOLD = 50000
+_TERM_COUNT_SIZE_MB = 16
+
+@functools.cache
+def _load_categories() -> Dict[str, List[str]]:
+    """Load the browser interest categories from snoopy.json, with keywords lowercased"""
+    with open("snoopy.json") as f:
+        categories = json.load(f)["browser"]["categories"]
+    return {category: [keyword.lower() for keyword in keywords]
+            for category, keywords in categories.items()}
+
+@functools.lru_cache(maxsize=16)
+def _build_keyword_matchers(
+        interest_categories: Tuple[Tuple[str, Tuple[str, ...]], ...]
+) -> Tuple[object, Dict[str, re.Pattern]]:
+    """
+    Build a single Aho-Corasick automaton over every category keyword,
+    or one compiled alternation per category without pyahocorasick
+
+    Memoized on a frozen copy of the categories, so profilers using the
+    snoopy.json defaults share one matcher and edited categories get their own.
+    """
+    if ahocorasick is not None:
+        keyword_categories = {}
+        for category, keywords in interest_categories:
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, set()).add(category)
+        if not keyword_categories:
+            return None, {}  # an automaton with no words can't be searched
+        automaton = ahocorasick.Automaton()
+        for keyword, categories in keyword_categories.items():
+            automaton.add_word(keyword, tuple(categories))
+        automaton.make_automaton()
+        return automaton, None
+
+    # An empty alternation would match every URL, so keyword-less categories
+    # get no pattern and never match, as with the automaton
+    patterns = {
+        category: re.compile('|'.join(sorted(map(re.escape, keywords), key=len, reverse=True)))
+        for category, keywords in interest_categories
+        if keywords
+    }
+    return None, patterns
 
 class UserProfiler:
     def __init__(self, history_limit: int = 500):
         """
-        Initialize the User Profiler with necessary NLTK downloads and category mappings
+        Initialize the User Profiler with category mappings
         """
-        # Download required NLTK data
-        try:
-            nltk.download("punkt", quiet=True)
-            nltk.download("punkt_tab", quiet=True)
-            nltk.download("stopwords", quiet=True)
-        except Exception as e:
-            print(f"Warning: NLTK download failed: {e}")
-
-        # Define interest categories and their associated keywords
-        self.interest_categories = json.load(open("snoopy.json"))["browser"]["categories"]
+        # Define interest categories and their associated keywords; copied so
+        # edits on one profiler don't leak into the shared cache
+        self.interest_categories = {category: list(keywords)
+                                    for category, keywords in _load_categories().items()}
 
         # Time patterns for user behavior analysis
         self.time_patterns = {
@@ -57,13 +125,22 @@ class UserProfiler:
             else:
                 return pd.DataFrame()  # Return empty DataFrame if no history
                 
+            # Mixed UTC offsets (e.g. across DST) leave an object column;
+            # drop the offsets so hours stay in local wall-clock time
+            timestamps = df['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps.map(lambda x: x.replace(tzinfo=None)))
+
+            # Keep only the most recent entries before deriving columns
+            recent = timestamps.nlargest(self.history_limit)
+            df = df.loc[recent.index]
+                
             # Add additional analyzed columns
-            df['domain'] = df['url'].apply(lambda x: urlparse(x).netloc)
-            df['hour'] = df['timestamp'].apply(lambda x: x.hour)
-            df['day_of_week'] = df['timestamp'].apply(lambda x: x.strftime('%A'))
+            df['domain'] = self._extract_domains(df['url'])
+            df['hour'] = recent.dt.hour
+            df['day_of_week'] = recent.dt.day_name()
             
-            # Sort and limit results
-            return df.sort_values('timestamp', ascending=False).head(self.history_limit)
+            return df
             
         except Exception as e:
             print(f"Error fetching browser history: {e}")
@@ -72,6 +149,15 @@ class UserProfiler:
             traceback.print_exc()
             return pd.DataFrame()
 
+    @staticmethod
+    def _extract_domains(urls: pd.Series) -> pd.Series:
+        """Extract the network location of each URL, using urlparse only for odd URLs"""
+        domains = urls.str.extract(_NETLOC_RE, expand=False)
+        unmatched = domains.isna()
+        if unmatched.any():
+            domains = domains.fillna(urls[unmatched].map(lambda x: urlparse(x).netloc))
+        return domains
+
     def analyze_content_patterns(self, df: pd.DataFrame) -> Dict:
         """
         Analyze content patterns in URLs and domains
@@ -83,23 +169,26 @@ class UserProfiler:
             Dict: Analysis of content patterns
         """
         # Extract words from URLs
-        words = []
-        for url in df['url']:
-            # Clean and tokenize URL
-            clean_url = re.sub(r'[^\w\s]', ' ', url.lower())
-            words.extend(word_tokenize(clean_url))
+        urls = df['url'].str.lower().tolist()
+        words = _TOKEN_RE.findall(" ".join(urls))
         
         # Remove stopwords and common URL terms
-        stop_words = set(stopwords.words('english'))
-        url_common_terms = {'com', 'www', 'http', 'https', 'org', 'net'}
-        filtered_words = [word for word in words 
-                         if word not in stop_words 
-                         and word not in url_common_terms
-                         and len(word) > 2]
+        stop_words = _STOP_WORDS
+        filtered_words = (word for word in words if word not in stop_words)
+
+        # Exact counts for typical histories, bounded memory for huge ones
+        if bounter is None or len(df) < _EXACT_COUNT_THRESHOLD:
+            common_terms = Counter(filtered_words).most_common(20)
+        else:
+            # need_iteration=True selects bounter's HashTable, which keeps the
+            # keys items() needs; it evicts rare terms once the budget is full
+            term_counts = bounter(size_mb=_TERM_COUNT_SIZE_MB, need_iteration=True)
+            term_counts.update(filtered_words)
+            common_terms = heapq.nlargest(20, term_counts.items(), key=itemgetter(1))
         
         return {
-            'common_terms': Counter(filtered_words).most_common(20),
-            'domain_frequency': Counter(df['domain']).most_common(10)
+            'common_terms': common_terms,
+            'domain_frequency': Counter(df['domain'].tolist()).most_common(10)
         }
 
     def determine_interests(self, df: pd.DataFrame) -> Dict[str, float]:
@@ -115,12 +204,24 @@ class UserProfiler:
         # Initialize scores
         interest_scores = {category: 0 for category in self.interest_categories}
         
-        # Analyze each URL
-        for url in df['url']:
-            url_lower = url.lower()
-            for category, keywords in self.interest_categories.items():
-                if any(keyword in url_lower for keyword in keywords):
-                    interest_scores[category] += 1
+        # Matchers follow this profiler's current categories
+        automaton, cat_patterns = _build_keyword_matchers(tuple(
+            (category, tuple(keywords))
+            for category, keywords in self.interest_categories.items()
+        ))
+        
+        # Analyze each URL, counting each category at most once per URL
+        urls = df['url'].str.lower().tolist()
+        for url_lower in urls:
+            if automaton is not None:
+                matched = set()
+                for _, categories in automaton.iter(url_lower):
+                    matched.update(categories)
+            else:
+                matched = [category for category, pattern in cat_patterns.items()
+                           if pattern.search(url_lower)]
+            for category in matched:
+                interest_scores[category] += 1
         
         # Normalize scores
         total_matches = sum(interest_scores.values())
@@ -139,25 +240,45 @@ class UserProfiler:
         Returns:
             Dict: Analysis of temporal patterns
         """
+        # Visits per hour of day, and the three busiest hours
+        hours = df['hour'].to_numpy(dtype=np.int8)
+        hour_totals = np.bincount(hours, minlength=24)
+        top_hours = np.argpartition(hour_totals, -3)[-3:]
+        top_hours = top_hours[np.argsort(-hour_totals[top_hours], kind='stable')]
+
         time_analysis = {
-            'peak_hours': df['hour'].value_counts().head(3).to_dict(),
-            'day_distribution': df['day_of_week'].value_counts().to_dict(),
+            'peak_hours': {int(h): int(hour_totals[h]) for h in top_hours if hour_totals[h]},
+            'day_distribution': dict(Counter(df['day_of_week'].tolist()).most_common()),
             'user_type': []
         }
         
         # Determine user type based on activity patterns
-        hour_counts = df['hour'].value_counts()
-        
-        if hour_counts.between(self.time_patterns['early_bird'][0], 
-                             self.time_patterns['early_bird'][1]).sum() > len(df) * 0.3:
+        if self._count_hours_in(hours, 'early_bird') > len(hours) * 0.3:
             time_analysis['user_type'].append('Early Bird')
             
-        if hour_counts.between(self.time_patterns['night_owl'][0], 
-                             self.time_patterns['night_owl'][1]).sum() > len(df) * 0.3:
+        if self._count_hours_in(hours, 'night_owl') > len(hours) * 0.3:
             time_analysis['user_type'].append('Night Owl')
             
         return time_analysis
 
+    def _count_hours_in(self, hours: np.ndarray, pattern: str) -> int:
+        """
+        Count visits falling in one of the time_patterns windows
+        
+        Args:
+            hours (np.ndarray): Hour of day of each visit
+            pattern (str): Key into self.time_patterns
+            
+        Returns:
+            int: Number of visits with start <= hour < end, wrapping past midnight
+        """
+        start, end = self.time_patterns[pattern]
+        if start <= end:
+            mask = (hours >= start) & (hours < end)
+        else:
+            mask = (hours >= start) | (hours < end)
+        return int(np.count_nonzero(mask))
+
     def generate_user_profile(self) -> Dict:
         """
         Generate comprehensive user profile based on browser history
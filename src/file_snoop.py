@@ -1,14 +1,160 @@
 import os
 from pathlib import Path
 from collections import Counter
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import json
 import magic  # for file type detection
 import time
 from datetime import datetime
-import pandas as pd
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import heapq
+import calendar
+from concurrent.futures import ProcessPoolExecutor
+
+
+class FileSummary:
+    """
+    Running aggregates of scanned file metadata, so a scan never has to keep
+    one row per file in memory.
+    """
+    def __init__(self, top_k: int = 5):
+        """
+        Args:
+            top_k: Number of largest files to keep track of
+        """
+        self.file_count = 0
+        self.total_size = 0
+        self.extension_counts = Counter()
+        self.creation_hours = Counter()
+        self.modification_hours = Counter()
+        self.modification_weekdays = Counter()
+        self.oldest_created = None
+        self.newest_created = None
+        self.top_k = top_k
+        self._largest = []  # min-heap of (size, path, name)
+
+    def add(self, path: str, name: str, stat: os.stat_result):
+        """Fold one file's metadata into the aggregates"""
+        self.file_count += 1
+        self.total_size += stat.st_size
+        self.extension_counts[os.path.splitext(name)[1].lower()] += 1
+        
+        # Hours and weekdays are reported in local time
+        created = time.localtime(stat.st_ctime)
+        modified = time.localtime(stat.st_mtime)
+        self.creation_hours[created.tm_hour] += 1
+        self.modification_hours[modified.tm_hour] += 1
+        self.modification_weekdays[modified.tm_wday] += 1
+        
+        if self.oldest_created is None or stat.st_ctime < self.oldest_created:
+            self.oldest_created = stat.st_ctime
+        if self.newest_created is None or stat.st_ctime > self.newest_created:
+            self.newest_created = stat.st_ctime
+        
+        self._push_largest((stat.st_size, path, name))
+
+    def merge(self, other: 'FileSummary'):
+        """Fold another summary, e.g. from a worker process, into this one"""
+        self.file_count += other.file_count
+        self.total_size += other.total_size
+        self.extension_counts.update(other.extension_counts)
+        self.creation_hours.update(other.creation_hours)
+        self.modification_hours.update(other.modification_hours)
+        self.modification_weekdays.update(other.modification_weekdays)
+        
+        for created in (other.oldest_created, other.newest_created):
+            if created is None:
+                continue
+            if self.oldest_created is None or created < self.oldest_created:
+                self.oldest_created = created
+            if self.newest_created is None or created > self.newest_created:
+                self.newest_created = created
+        
+        for item in other._largest:
+            self._push_largest(item)
+
+    def _push_largest(self, item: Tuple[int, str, str]):
+        """Offer a (size, path, name) entry to the largest-files heap"""
+        if len(self._largest) < self.top_k:
+            heapq.heappush(self._largest, item)
+        elif item > self._largest[0]:
+            heapq.heapreplace(self._largest, item)
+
+    def largest_files(self) -> List[Dict]:
+        """Return the largest files seen, biggest first"""
+        return [{'name': name, 'size': size, 'path': path}
+                for size, path, name in sorted(self._largest, reverse=True)]
+
+
+def _scan_dir(directory: str, excluded_dirs: Set[str]) -> Tuple[List[os.DirEntry], List[str]]:
+    """
+    List the files and subdirectories directly inside one directory
+    
+    Args:
+        directory: Directory to list
+        excluded_dirs: Directory names to leave out of the subdirectories
+        
+    Returns:
+        Tuple of the file entries and the paths of the non-excluded subdirectories
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+    except OSError:
+        pass  # unreadable directory, as os.walk would skip it
+    return files, subdirs
+
+
+def _walk(root: str, excluded_dirs: Set[str]) -> Iterator[os.DirEntry]:
+    """
+    Yield file entries under root, skipping excluded directories
+    
+    Args:
+        root: Directory to start from
+        excluded_dirs: Directory names not to descend into
+        
+    Returns:
+        Iterator over the os.DirEntry of every file found
+    """
+    # Depth-first, top-down like os.walk, so file_limit keeps picking the same files
+    pending = [root]
+    while pending:
+        files, subdirs = _scan_dir(pending.pop(), excluded_dirs)
+        pending.extend(reversed(subdirs))
+        yield from files
+
+
+def _scan_tree(root: str, excluded_dirs: Set[str], file_limit: int) -> FileSummary:
+    """
+    Summarize up to file_limit files under root
+    
+    Module-level so it can run in a ProcessPoolExecutor worker.
+    """
+    summary = FileSummary()
+    if file_limit <= 0:
+        return summary
+    
+    for entry in _walk(root, excluded_dirs):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        summary.add(entry.path, entry.name, stat)
+        
+        if summary.file_count >= file_limit:
+            break
+    
+    return summary
+
 
 class FileProfiler:
     """
@@ -18,7 +164,8 @@ class FileProfiler:
     def __init__(self, 
                  scan_paths: List[str] = None,
                  excluded_dirs: Set[str] = None,
-                 file_limit: int = 10000):
+                 file_limit: int = 10000,
+                 scan_workers: int = 1):
         """
         Initialize the File Profiler with configuration settings
         
@@ -26,6 +173,8 @@ class FileProfiler:
             scan_paths: List of directory paths to scan. Defaults to user's home directory
             excluded_dirs: Set of directory names to exclude (e.g., 'node_modules')
             file_limit: Maximum number of files to analyze
+            scan_workers: Number of processes scanning top-level subdirectories
+                          in parallel. 1 scans serially in this process
         """
         # Set default scan paths if none provided
         self.scan_paths = scan_paths or [str(Path.home())]
@@ -44,115 +193,151 @@ class FileProfiler:
             'design': {'.psd', '.ai', '.fig', '.sketch', '.xd'},
             'data_science': {'.ipynb', '.r', '.mat', '.json', '.yaml'},
         }
+        self._ext_to_cat = {ext: category
+                            for category, extensions in self.file_categories.items()
+                            for ext in extensions}
         
         self.file_limit = file_limit
-        self.mime_magic = magic.Magic(mime=True)
+        self.scan_workers = scan_workers
+        self.mime_magic = None  # created on first use by get_mime
 
-    def scan_files(self) -> pd.DataFrame:
+    def scan_files(self) -> FileSummary:
         """
-        Scan filesystem and collect file metadata
+        Scan filesystem and aggregate file metadata in a single pass
+        
+        With scan_workers > 1 each top-level subdirectory is scanned in a
+        worker process. A subdirectory whose partial summary would push the
+        total past file_limit is rescanned here with just the remaining budget,
+        so the limit holds exactly.
         
         Returns:
-            pd.DataFrame: DataFrame containing file metadata
-        """
-        files_data = []
-        processed_count = 0
-        
-        def process_file(file_path: Path) -> Dict:
-            """Process a single file and return its metadata"""
-            try:
-                stat = file_path.stat()
-                return {
-                    'path': str(file_path),
-                    'name': file_path.name,
-                    'extension': file_path.suffix.lower(),
-                    'size': stat.st_size,
-                    'created': datetime.fromtimestamp(stat.st_ctime),
-                    'modified': datetime.fromtimestamp(stat.st_mtime),
-                    'accessed': datetime.fromtimestamp(stat.st_atime),
-                    'mime_type': self.mime_magic.from_file(str(file_path))
-                }
-            except Exception as e:
-                return None
-
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=4) as executor:
+            FileSummary: Aggregated metadata of the scanned files
+        """
+        summary = FileSummary()
+        
+        if self.scan_workers <= 1:
+            # Each file only costs a stat(), so process entries serially
             for root_path in self.scan_paths:
-                for root, dirs, files in os.walk(root_path):
-                    # Skip excluded directories
-                    dirs[:] = [d for d in dirs if d not in self.excluded_dirs]
-                    
-                    # Process files in parallel
-                    file_paths = [Path(root) / f for f in files]
-                    results = executor.map(process_file, file_paths)
-                    
-                    # Add valid results to our dataset
-                    for result in results:
-                        if result:
-                            files_data.append(result)
-                            processed_count += 1
-                            
-                        if processed_count >= self.file_limit:
-                            break
-                    
-                    if processed_count >= self.file_limit:
+                remaining = self.file_limit - summary.file_count
+                summary.merge(_scan_tree(root_path, self.excluded_dirs, remaining))
+                if summary.file_count >= self.file_limit:
+                    break
+            return summary
+        
+        with ProcessPoolExecutor(max_workers=self.scan_workers) as executor:
+            for root_path in self.scan_paths:
+                # Files directly under the root are handled here; each
+                # subdirectory becomes one unit of work for the pool
+                files, subdirs = _scan_dir(root_path, self.excluded_dirs)
+                for entry in files:
+                    if summary.file_count >= self.file_limit:
+                        break
+                    try:
+                        summary.add(entry.path, entry.name, entry.stat())
+                    except OSError:
+                        continue
+                
+                remaining = self.file_limit - summary.file_count
+                if remaining <= 0:
+                    break
+                
+                partials = executor.map(_scan_tree, subdirs,
+                                        [self.excluded_dirs] * len(subdirs),
+                                        [remaining] * len(subdirs))
+                for subdir, partial in zip(subdirs, partials):
+                    remaining = self.file_limit - summary.file_count
+                    if partial.file_count > remaining:
+                        # Only part of this subdirectory fits in the budget
+                        partial = _scan_tree(subdir, self.excluded_dirs, remaining)
+                    summary.merge(partial)
+                    if summary.file_count >= self.file_limit:
                         break
+                
+                if summary.file_count >= self.file_limit:
+                    # Don't wait on subdirectories whose results we'd discard
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+        
+        return summary
+
+    def get_mime(self, path: str) -> Optional[str]:
+        """
+        Detect the MIME type of a single file
         
-        return pd.DataFrame(files_data)
+        Args:
+            path: Path of the file to inspect
+            
+        Returns:
+            MIME type reported by libmagic, or None if the file can't be read
+        """
+        if self.mime_magic is None:
+            self.mime_magic = magic.Magic(mime=True)
+        try:
+            return self.mime_magic.from_file(path)
+        except Exception:
+            return None
 
-    def analyze_file_patterns(self, df: pd.DataFrame) -> Dict:
+    def analyze_file_patterns(self, summary: FileSummary) -> Dict:
         """
         Analyze patterns in file usage and types
         
         Args:
-            df: DataFrame containing file metadata
+            summary: Aggregated file metadata from scan_files
             
         Returns:
             Dict containing various file pattern analyses
         """
         # Initialize analysis dictionary
         analysis = {
-            'extension_counts': Counter(df['extension'].value_counts().to_dict()),
-            'category_distribution': {},
+            'extension_counts': Counter(dict(summary.extension_counts.most_common())),
+            'category_distribution': self._category_counts(summary.extension_counts),
             'temporal_patterns': {
-                'creation_hours': df['created'].dt.hour.value_counts().to_dict(),
-                'modification_hours': df['modified'].dt.hour.value_counts().to_dict(),
-                'weekly_activity': df['modified'].dt.day_name().value_counts().to_dict()
+                'creation_hours': dict(summary.creation_hours.most_common()),
+                'modification_hours': dict(summary.modification_hours.most_common()),
+                'weekly_activity': {calendar.day_name[day]: count
+                                    for day, count in summary.modification_weekdays.most_common()}
             },
             'size_metrics': {
-                'total_size': df['size'].sum(),
-                'average_size': df['size'].mean(),
-                'largest_files': df.nlargest(5, 'size')[['name', 'size', 'path']].to_dict('records')
+                'total_size': summary.total_size,
+                'average_size': summary.total_size / summary.file_count if summary.file_count else 0.0,
+                'largest_files': summary.largest_files()
             }
         }
         
-        # Calculate category distribution
-        for category, extensions in self.file_categories.items():
-            category_files = df[df['extension'].isin(extensions)]
-            analysis['category_distribution'][category] = len(category_files)
+        # MIME detection reads each file, so only do it for the few we report
+        for record in analysis['size_metrics']['largest_files']:
+            record['mime_type'] = self.get_mime(record['path'])
         
         return analysis
 
-    def determine_user_interests(self, df: pd.DataFrame) -> Dict[str, float]:
+    def _category_counts(self, extension_counts: Counter) -> Dict[str, int]:
+        """Fold per-extension counts into per-category counts"""
+        category_counts = dict.fromkeys(self.file_categories, 0)
+        for ext, count in extension_counts.items():
+            category = self._ext_to_cat.get(ext)
+            if category is not None:
+                category_counts[category] += count
+        return category_counts
+
+    def determine_user_interests(self, summary: FileSummary) -> Dict[str, float]:
         """
         Calculate interest scores based on file types and patterns
         
         Args:
-            df: DataFrame containing file metadata
+            summary: Aggregated file metadata from scan_files
             
         Returns:
             Dict containing interest categories and their scores
         """
-        # Initialize interest scores
-        interest_scores = {category: 0 for category in self.file_categories.keys()}
-        
         # Calculate total files for normalization
-        total_files = len(df)
+        total_files = summary.file_count
         
         # Calculate scores based on file categories
-        for category, extensions in self.file_categories.items():
-            category_count = len(df[df['extension'].isin(extensions)])
-            interest_scores[category] = category_count / total_files if total_files > 0 else 0
+        category_counts = self._category_counts(summary.extension_counts)
+        interest_scores = {
+            category: category_counts[category] / total_files if total_files > 0 else 0
+            for category in self.file_categories
+        }
             
         return interest_scores
 
@@ -164,13 +349,13 @@ class FileProfiler:
             Dict containing complete file-based user profile
         """
         # Scan files
-        df = self.scan_files()
-        if df.empty:
+        summary = self.scan_files()
+        if not summary.file_count:
             return {"error": "No files found or accessible"}
 
         # Perform analyses
-        file_patterns = self.analyze_file_patterns(df)
-        interests = self.determine_user_interests(df)
+        file_patterns = self.analyze_file_patterns(summary)
+        interests = self.determine_user_interests(summary)
 
         # Generate insights
         insights = self._generate_insights(file_patterns, interests)
@@ -180,11 +365,11 @@ class FileProfiler:
             'interests': interests,
             'insights': insights,
             'summary': {
-                'total_files_analyzed': len(df),
+                'total_files_analyzed': summary.file_count,
                 'total_size_gb': file_patterns['size_metrics']['total_size'] / (1024**3),
                 'date_range': {
-                    'oldest_file': df['created'].min(),
-                    'newest_file': df['created'].max()
+                    'oldest_file': datetime.fromtimestamp(summary.oldest_created),
+                    'newest_file': datetime.fromtimestamp(summary.newest_created)
                 }
             }
         }
@@ -1,52 +1,84 @@
+import asyncio
 import socket
-from socket import ConnectionError
+import sys
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Serve a single client connection: read one message and acknowledge it.
+
+    Args:
+        reader (asyncio.StreamReader): Stream to read the client's data from
+        writer (asyncio.StreamWriter): Stream to send the response on
+    """
+    client_address = writer.get_extra_info('peername')
+    # Send small responses immediately instead of waiting on Nagle's algorithm
+    client_socket = writer.get_extra_info('socket')
+    if client_socket is not None:
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    print(f"Connection established with {client_address}")
+    try:
+        # Receive data from the client
+        data = await reader.read(1024)
+        if not data:
+            return  # Nothing to acknowledge
+        print(f"Received data: {data.decode('utf-8', errors='replace')}")
+        # Send a response back to the client
+        response = "Data received"
+        writer.write(response.encode('utf-8'))
+        await writer.drain()
+    except ConnectionError as e:
+        print(f"Connection error: {e}")
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+async def serve(host='0.0.0.0', port=65432):
+    """
+    Accept connections concurrently until the server is cancelled.
+
+    Args:
+        host (str): The hostname or IP address to bind the server to.
+        port (int): The port number to listen on.
+    """
+    # reuse_address avoids "Address already in use" errors on restart
+    server = await asyncio.start_server(handle_client, host, port,
+                                        reuse_address=True,
+                                        backlog=socket.SOMAXCONN)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"Server started on {bound_host}:{bound_port}")
+    if host == '0.0.0.0':
+        print(f"Local IP addresses:")
+        # Display all available network interfaces for connection
+        addresses = socket.getaddrinfo(socket.gethostname(), None)
+        for addr in addresses:
+            if addr[0] == socket.AF_INET:  # Only show IPv4 addresses
+                print(f"  - {addr[4][0]}")
+
+    async with server:
+        await server.serve_forever()
 
 def start_server(host='0.0.0.0', port=65432):
     """
     Start a TCP server that listens for incoming connections from any network.
-    
+
     Args:
-        host (str): The hostname or IP address to bind the server to. 
+        host (str): The hostname or IP address to bind the server to.
                    '0.0.0.0' means listen on all available network interfaces.
         port (int): The port number to listen on. Default is 65432.
     """
-    # Create a TCP socket
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
-        # Allow port reuse to avoid "Address already in use" errors
-        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        
-        try:
-            # Bind the socket to all interfaces
-            server_socket.bind((host, port))
-            # Enable the server to accept connections (max 5 queued connections)
-            server_socket.listen(5)
-            print(f"Server started on all interfaces at port {port}")
-            print(f"Local IP addresses:")
-            # Display all available network interfaces for connection
-            addresses = socket.getaddrinfo(socket.gethostname(), None)
-            for addr in addresses:
-                if addr[0] == socket.AF_INET:  # Only show IPv4 addresses
-                    print(f"  - {addr[4][0]}")
-
-            while True:
-                try:
-                    # Accept a new connection
-                    client_socket, client_address = server_socket.accept()
-                    with client_socket:
-                        print(f"Connection established with {client_address}")
-                        # Receive data from the client
-                        data = client_socket.recv(1024)
-                        if not data:
-                            continue  # Skip to next iteration if no data
-                        print(f"Received data: {data.decode('utf-8')}")
-                        # Send a response back to the client
-                        response = "Data received"
-                        client_socket.sendall(response.encode('utf-8'))
-                except ConnectionError as e:
-                    print(f"Connection error: {e}")
-                    continue
-                
-        except KeyboardInterrupt:
-            print("\nServer shutting down...")
-        except Exception as e:
-            print(f"Error starting server: {e}")
\ No newline at end of file
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        print("\nServer shutting down...")
+    except Exception as e:
+        print(f"Error starting server: {e}")
+
+if __name__ == "__main__":
+    # Usage: python run_server.py [host] [port]
+    host = sys.argv[1] if len(sys.argv) > 1 else '0.0.0.0'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 65432
+    start_server(host, port)